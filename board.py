@@ -0,0 +1,96 @@
+"""Estado incremental y compacto de un tablero de espacios y fichas.
+
+El tablero se actualiza solo cuando se coloca o se quita una ficha, así que
+los niveles pueden consultar si está lleno, si es correcto o qué palabra
+forma sin recorrer los espacios en cada cuadro. Espacios y fichas se
+identifican por su índice y la ocupación se guarda en arreglos, de modo que
+copiar o restaurar el estado (para deshacer o simular) cuesta O(tamaño).
+"""
+from array import array
+
+EMPTY = -1
+
+
+class Board:
+    """Tablero de espacios y fichas.
+
+    `dirty` se activa en place() y lo limpia el nivel al atender la
+    colocación, de modo que update() solo valida tras un cambio.
+    """
+
+    __slots__ = ("correct_texts", "item_texts", "slot_items", "item_slots",
+                 "occupied_count", "correct_mask", "full_mask", "word", "dirty")
+
+    def __init__(self, correct_texts, item_texts):
+        self.correct_texts = tuple(correct_texts)
+        self.item_texts = tuple(item_texts)
+        self.slot_items = array("h", [EMPTY]) * len(self.correct_texts)
+        self.item_slots = array("h", [EMPTY]) * len(self.item_texts)
+        self.occupied_count = 0
+        self.correct_mask = 0
+        self.full_mask = (1 << len(self.correct_texts)) - 1
+        self.word = ""
+        self.dirty = False
+
+    def place(self, index, item):
+        """Coloca la ficha `item` en el espacio `index` y marca el tablero para validar
+
+        Si la ficha ya estaba en otro espacio, ese espacio queda vacío; si el
+        espacio tenía otra ficha, esa ficha vuelve a quedar libre.
+        """
+        old_slot = self.item_slots[item]
+        if old_slot == index:
+            return
+        if old_slot != EMPTY:
+            self.remove(old_slot)
+        previous = self.slot_items[index]
+        if previous == EMPTY:
+            self.occupied_count += 1
+        else:
+            self.item_slots[previous] = EMPTY
+        self.slot_items[index] = item
+        self.item_slots[item] = index
+        if self.item_texts[item] == self.correct_texts[index]:
+            self.correct_mask |= 1 << index
+        else:
+            self.correct_mask &= ~(1 << index)
+        self._refresh_word()
+        self.dirty = True
+
+    def remove(self, index):
+        """Vacía el espacio `index` y devuelve la ficha que tenía (o EMPTY)"""
+        item = self.slot_items[index]
+        if item != EMPTY:
+            self.slot_items[index] = EMPTY
+            self.item_slots[item] = EMPTY
+            self.occupied_count -= 1
+            self.correct_mask &= ~(1 << index)
+            self._refresh_word()
+        return item
+
+    def snapshot(self):
+        """Copia inmutable del estado actual"""
+        return (self.slot_items.tobytes(), self.item_slots.tobytes(),
+                self.occupied_count, self.correct_mask, self.word)
+
+    def restore(self, state):
+        """Vuelve al estado guardado con snapshot()"""
+        slot_items, item_slots, self.occupied_count, self.correct_mask, self.word = state
+        self.slot_items = array("h")
+        self.slot_items.frombytes(slot_items)
+        self.item_slots = array("h")
+        self.item_slots.frombytes(item_slots)
+        self.dirty = False
+
+    def is_full(self):
+        return self.occupied_count == len(self.slot_items)
+
+    def is_correct(self):
+        return self.correct_mask == self.full_mask
+
+    def is_slot_correct(self, index):
+        return bool(self.correct_mask >> index & 1)
+
+    def _refresh_word(self):
+        texts = self.item_texts
+        self.word = "".join(texts[item] for item in self.slot_items if item != EMPTY)
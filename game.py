@@ -6,6 +6,8 @@ import time
 import queue
 from abc import ABC, abstractmethod
 import pyttsx3
+from board import EMPTY, Board
+from puzzles import PACK_PATH, generate_level1, generate_level2, generate_level3, load_pack
 
 pygame.init()
 pygame.font.init()
@@ -27,6 +29,8 @@ font_large = pygame.font.SysFont('Arial', 40)
 font_medium = pygame.font.SysFont('Arial', 30)
 font_small = pygame.font.SysFont('Arial', 20)
 
+puzzle_pack = load_pack(PACK_PATH, WIDTH, HEIGHT)
+
 class GameNotifier:
     def __init__(self):
         self.observers = []
@@ -92,8 +96,11 @@ class Timer:
         return time.strftime("%M:%S", time.gmtime(self.elapsed))
 
 class DraggableItem:
-    def __init__(self, text, x, y, width=100, height=50, color=LIGHT_BLUE):
+    __slots__ = ("text", "index", "original_pos", "rect", "dragging", "placed", "color")
+
+    def __init__(self, text, x, y, width=100, height=50, color=LIGHT_BLUE, index=0):
         self.text = text
+        self.index = index
         self.original_pos = (x, y)
         self.rect = pygame.Rect(x, y, width, height)
         self.dragging = False
@@ -115,9 +122,12 @@ class DraggableItem:
         self.dragging = False
 
 class DropSpace:
-    def __init__(self, x, y, width=100, height=50, correct_text=""):
+    __slots__ = ("rect", "correct_text", "index", "occupied", "current_item")
+
+    def __init__(self, x, y, width=100, height=50, correct_text="", index=0):
         self.rect = pygame.Rect(x, y, width, height)
         self.correct_text = correct_text
+        self.index = index
         self.occupied = False
         self.current_item = None
 
@@ -128,38 +138,46 @@ class DropSpace:
         pygame.draw.rect(surface, color, self.rect, border_radius=10)
         pygame.draw.rect(surface, BLACK, self.rect, 2, border_radius=10)
 
+def place_item(board, space, item):
+    """Coloca una ficha en un espacio y actualiza el tablero"""
+    item.rect.center = space.rect.center
+    item.placed = True
+    space.occupied = True
+    space.current_item = item
+    board.place(space.index, item.index)
+
+def remove_item(board, space):
+    """Devuelve a su lugar la ficha de un espacio y actualiza el tablero"""
+    space.current_item.reset_position()
+    space.occupied = False
+    space.current_item = None
+    board.remove(space.index)
+
+def sync_items(board, spaces, items):
+    """Recoloca espacios y fichas según el estado del tablero"""
+    for space in spaces:
+        space.occupied = False
+        space.current_item = None
+    for item in items:
+        slot = board.item_slots[item.index]
+        if slot == EMPTY:
+            item.reset_position()
+        else:
+            space = spaces[slot]
+            item.rect.center = space.rect.center
+            item.placed = True
+            item.dragging = False
+            space.occupied = True
+            space.current_item = item
+
 class Level1: 
     def __init__(self, notifier):
         self.notifier = notifier
         self.attempts = 3
         self.current_attempt = 0
-        self.words = ["computadora", "telefono", "elefante", "mariposa", "biblioteca", "universidad"]
         self.word = None
         self.setup_level()
 
-    def _split_syllables(self, word):
-        vowels = "aeiouáéíóú"
-        syllables = []
-        current_syllable = ""
-        
-        for char in word:
-            current_syllable += char
-            if char in vowels:
-                syllables.append(current_syllable)
-                current_syllable = ""
-        
-        if current_syllable:
-            if syllables:
-                syllables[-1] += current_syllable
-            else:
-                syllables.append(current_syllable)
-        
-        if len(syllables) < 2:
-            mid = len(word) // 2
-            return [word[:mid], word[mid:]]
-        
-        return syllables
-
     def _get_word_category(self):
         categories = {
             "computadora": "dispositivo electrónico",
@@ -172,10 +190,10 @@ class Level1:
         return categories.get(self.word, "objeto o concepto conocido")
 
     def setup_level(self):
-        self.word = random.choice(self.words)
-        self.syllables = self._split_syllables(self.word)
-        self.correct_syllables = self.syllables.copy()
-        random.shuffle(self.syllables)
+        puzzle = (puzzle_pack and puzzle_pack.sample(1)) or generate_level1(random, WIDTH, HEIGHT)
+        self.word = puzzle["word"]
+        self.correct_syllables = [text for text, _, _ in puzzle["spaces"]]
+        self.syllables = self.correct_syllables.copy()
         self.spaces = []
         self.draggables = []
         self.completed = False
@@ -189,32 +207,22 @@ class Level1:
                    f"Tienes {self.attempts} intentos para completarla."
         })
 
-        start_x = WIDTH // 2 - (len(self.syllables) * 110) // 2
-        for i, correct_syll in enumerate(self.correct_syllables):
-            self.spaces.append(DropSpace(start_x + i * 110, 200, correct_text=correct_syll))
-        
-        distractors = ["ción", "mente", "ando", "iendo", "mente", "ción", "ando"]
-        all_syllables = self.syllables + random.sample(distractors, min(3, len(distractors)))
-        random.shuffle(all_syllables)
-        
-        for i, syll in enumerate(all_syllables):
-            x = 150 + (i % 4) * 180
-            y = 350 + (i // 4) * 80
-            self.draggables.append(DraggableItem(syll, x, y, color=YELLOW))
+        for i, (text, x, y) in enumerate(puzzle["spaces"]):
+            self.spaces.append(DropSpace(x, y, correct_text=text, index=i))
+        for i, (text, x, y) in enumerate(puzzle["tiles"]):
+            self.draggables.append(DraggableItem(text, x, y, color=YELLOW, index=i))
+        self.board = Board(self.correct_syllables, (item.text for item in self.draggables))
+        self.history = []
 
     def update(self):
         if self.error_timer > 0:
             self.error_timer -= 1
             
-        if not self.completed:
-            all_filled = all(space.occupied for space in self.spaces)
-            if all_filled:
-                formed_word = ""
-                for space in self.spaces:
-                    if space.current_item:
-                        formed_word += space.current_item.text
-                
-                if formed_word == self.word:
+        if not self.completed and self.board.dirty:
+            self.board.dirty = False
+            if self.board.is_full():
+                self.history.clear()
+                if self.board.word == self.word:
                     self.completed = True
                     self.notifier.notify({"type": "speak", "text": f"¡Excelente! La palabra es {self.word}"})
                 else:
@@ -231,9 +239,7 @@ class Level1:
                         
                         for space in self.spaces:
                             if space.occupied:
-                                space.current_item.reset_position()
-                                space.occupied = False
-                                space.current_item = None
+                                remove_item(self.board, space)
 
     def draw(self, surface):
         for space in self.spaces:
@@ -262,6 +268,21 @@ class Level1:
             pygame.draw.rect(surface, RED, alert_rect, 2, border_radius=10)
             surface.blit(error_surf, (WIDTH//2 - error_surf.get_width()//2, 500))
 
+    def snapshot(self):
+        """Copia compacta del estado del nivel para deshacer o simular"""
+        return (self.board.snapshot(), self.current_attempt, self.completed)
+
+    def restore(self, state):
+        board_state, self.current_attempt, self.completed = state
+        self.board.restore(board_state)
+        sync_items(self.board, self.spaces, self.draggables)
+
+    def undo(self):
+        """Deshace la última ficha colocada"""
+        if self.history:
+            self.restore(self.history.pop())
+            self.notifier.notify({"type": "speak", "text": "Deshacer"})
+
     def handle_event(self, event):
         if self.error_timer > 0 and event.type == pygame.MOUSEBUTTONDOWN:
             self.error_timer = 0
@@ -285,10 +306,8 @@ class Level1:
                         
                         for space in self.spaces:
                             if space.rect.collidepoint(event.pos) and not space.occupied:
-                                item.rect.center = space.rect.center
-                                item.placed = True
-                                space.occupied = True
-                                space.current_item = item
+                                self.history.append(self.snapshot())
+                                place_item(self.board, space, item)
                                 placed = True
                                 self.notifier.notify({"type": "speak", "text": item.text})
                                 break
@@ -310,36 +329,12 @@ class Level1:
 class Level2:  
     def __init__(self, notifier):
         self.notifier = notifier
-        self.words = ["caminar", "pelota", "ventana", "caballo", "escuela", "jardín", "montaña", "libro"]
         self.word = None
         self.setup_level()
         self.time_limit = 120
         self.time_penalty = 10
         self.error_count = 0
 
-    def _split_syllables(self, word):
-        vowels = "aeiouáéíóú"
-        syllables = []
-        current_syllable = ""
-        
-        for char in word:
-            current_syllable += char
-            if char in vowels:
-                syllables.append(current_syllable)
-                current_syllable = ""
-        
-        if current_syllable:
-            if syllables:
-                syllables[-1] += current_syllable
-            else:
-                syllables.append(current_syllable)
-        
-        if len(syllables) < 2:
-            mid = len(word) // 2
-            return [word[:mid], word[mid:]]
-        
-        return syllables
-
     def _get_word_category(self):
         if self.word in ["caminar", "pelota"]:
             return "acción o objeto común"
@@ -350,8 +345,9 @@ class Level2:
         return "palabra común"
 
     def setup_level(self):
-        self.word = random.choice(self.words)
-        self.syllables = self._split_syllables(self.word)
+        puzzle = (puzzle_pack and puzzle_pack.sample(2)) or generate_level2(random, WIDTH, HEIGHT)
+        self.word = puzzle["word"]
+        self.syllables = [text for text, _, _ in puzzle["spaces"]]
         self.spaces = []
         self.draggables = []
         self.completed = False
@@ -364,16 +360,12 @@ class Level2:
                    f"La palabra tiene {len(self.word)} letras. Arrastra las sílabas correctas a los espacios."
         })
 
-        start_x = WIDTH // 2 - (len(self.syllables) * 110) // 2
-        for i, syll in enumerate(self.syllables):
-            self.spaces.append(DropSpace(start_x + i * 110, 200, correct_text=syll))
-
-        all_syllables = self.syllables + ["la", "lo", "pa", "sa", "ti", "ma", "no", "que", "de", "en"]
-        random.shuffle(all_syllables)
-        for i, syll in enumerate(all_syllables):
-            x = 150 + (i % 5) * 150
-            y = 350 + (i // 5) * 80
-            self.draggables.append(DraggableItem(syll, x, y))
+        for i, (text, x, y) in enumerate(puzzle["spaces"]):
+            self.spaces.append(DropSpace(x, y, correct_text=text, index=i))
+        for i, (text, x, y) in enumerate(puzzle["tiles"]):
+            self.draggables.append(DraggableItem(text, x, y, index=i))
+        self.board = Board(self.syllables, (item.text for item in self.draggables))
+        self.history = []
 
     def update(self):
         current_time = time.time()
@@ -385,22 +377,19 @@ class Level2:
             self.setup_level()
             return
             
-        if not self.completed:
-            all_occupied = all(space.occupied for space in self.spaces)
-            all_correct = all(space.occupied and space.current_item.text == space.correct_text 
-                             for space in self.spaces)
-            if all_correct:
+        if not self.completed and self.board.dirty:
+            self.board.dirty = False
+            if self.board.is_full():
+                self.history.clear()
+            if self.board.is_correct():
                 self.completed = True
                 self.notifier.notify({"type": "speak", "text": f"¡Correcto! La palabra es {self.word}"})
-            elif all_occupied:
+            elif self.board.is_full():
                 self.error_count += 1
                 self.notifier.notify({"type": "speak", "text": "Palabra incorrecta. Pierdes 10 segundos. Intenta de nuevo."})
                 for space in self.spaces:
-                    if space.current_item and space.current_item.text != space.correct_text:
-                        space.current_item.reset_position()
-                        space.current_item.placed = False
-                        space.occupied = False
-                        space.current_item = None
+                    if space.occupied and not self.board.is_slot_correct(space.index):
+                        remove_item(self.board, space)
 
     def draw(self, surface):
         for space in self.spaces:
@@ -431,6 +420,21 @@ class Level2:
         error_text = font_small.render(f"Errores: {self.error_count}", True, RED)
         surface.blit(error_text, (WIDTH - 150, 50))
 
+    def snapshot(self):
+        """Copia compacta del estado del nivel para deshacer o simular"""
+        return (self.board.snapshot(), self.error_count, self.completed)
+
+    def restore(self, state):
+        board_state, self.error_count, self.completed = state
+        self.board.restore(board_state)
+        sync_items(self.board, self.spaces, self.draggables)
+
+    def undo(self):
+        """Deshace la última ficha colocada"""
+        if self.history:
+            self.restore(self.history.pop())
+            self.notifier.notify({"type": "speak", "text": "Deshacer"})
+
     def handle_event(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN:
             if event.button == 1: 
@@ -450,10 +454,8 @@ class Level2:
 
                         for space in self.spaces:
                             if space.rect.collidepoint(event.pos) and not space.occupied:
-                                item.rect.center = space.rect.center
-                                item.placed = True
-                                space.occupied = True
-                                space.current_item = item
+                                self.history.append(self.snapshot())
+                                place_item(self.board, space, item)
                                 placed = True
                                 self.notifier.notify({"type": "speak", "text": item.text})
                                 break
@@ -474,19 +476,15 @@ class Level2:
 class Level3:  
     def __init__(self, notifier):
         self.notifier = notifier
-        self.word_groups = {
-            "mariposa": ["mar", "piso", "rosa", "sopa", "ramo", "pasa"],
-            "elefante": ["ele", "fante", "tela", "lefa", "flan", "ante"],
-            "biblioteca": ["libro", "teca", "bota", "beca", "lote", "biblia"]
-        }
         self.required_words = 3
         self.incorrect_attempts = 0
         self.max_incorrect = 5
         self.setup_level()
 
     def setup_level(self):
-        self.big_word = random.choice(list(self.word_groups.keys()))
-        self.possible_words = self.word_groups[self.big_word]
+        puzzle = (puzzle_pack and puzzle_pack.sample(3)) or generate_level3(random, WIDTH, HEIGHT)
+        self.big_word = puzzle["word"]
+        self.possible_words = puzzle["words"]
         self.found_words = []
         self.letter_spaces = []
         self.draggable_letters = []
@@ -500,19 +498,20 @@ class Level3:
                    f"Máximo {self.max_incorrect} errores permitidos."
         })
         
-        for i in range(len(self.big_word)):
-            self.letter_spaces.append(DropSpace((WIDTH//2 - 200) + i * 50, 250, width=40, height=40))
-        
-        letters = list(self.big_word)
-        random.shuffle(letters)
-        for i, letter in enumerate(letters):
-            x = 150 + (i % 8) * 80
-            y = 350 + (i // 8) * 60
-            self.draggable_letters.append(DraggableItem(letter, x, y, width=40, height=40))
+        for i, (_, x, y) in enumerate(puzzle["spaces"]):
+            self.letter_spaces.append(DropSpace(x, y, width=40, height=40, index=i))
+        for i, (letter, x, y) in enumerate(puzzle["tiles"]):
+            self.draggable_letters.append(DraggableItem(letter, x, y, width=40, height=40, index=i))
+        self.board = Board((space.correct_text for space in self.letter_spaces),
+                           (letter.text for letter in self.draggable_letters))
+        self.history = []
 
     def update(self):
         if self.error_timer > 0:
             self.error_timer -= 1
+
+        # Este nivel valida al pulsar "Verificar", no al colocar cada letra.
+        self.board.dirty = False
             
         if not self.completed and len(self.found_words) >= self.required_words:
             self.completed = True
@@ -527,7 +526,7 @@ class Level3:
 
     def get_current_word(self):
         """Obtiene la palabra actual formada por las letras colocadas"""
-        return "".join([space.current_item.text for space in self.letter_spaces if space.occupied])
+        return self.board.word
 
     def verify_word(self, word):
         """Verifica si la palabra es válida"""
@@ -547,11 +546,10 @@ class Level3:
 
     def reset_letters(self):
         """Restablece todas las letras colocadas"""
+        self.history.clear()
         for space in self.letter_spaces:
             if space.occupied:
-                space.current_item.reset_position()
-                space.occupied = False
-                space.current_item = None
+                remove_item(self.board, space)
 
     def draw(self, surface):
         surface.fill(WHITE)
@@ -601,6 +599,22 @@ class Level3:
             pygame.draw.rect(surface, RED, alert_rect, 2, border_radius=10)
             surface.blit(error_surf, (WIDTH//2 - error_surf.get_width()//2, 500))
 
+    def snapshot(self):
+        """Copia compacta del estado del nivel para deshacer o simular"""
+        return (self.board.snapshot(), tuple(self.found_words), self.incorrect_attempts, self.completed)
+
+    def restore(self, state):
+        board_state, found_words, self.incorrect_attempts, self.completed = state
+        self.found_words = list(found_words)
+        self.board.restore(board_state)
+        sync_items(self.board, self.letter_spaces, self.draggable_letters)
+
+    def undo(self):
+        """Deshace la última ficha colocada"""
+        if self.history:
+            self.restore(self.history.pop())
+            self.notifier.notify({"type": "speak", "text": "Deshacer"})
+
     def handle_event(self, event):
         if self.error_timer > 0 and event.type == pygame.MOUSEBUTTONDOWN:
             self.error_timer = 0
@@ -646,10 +660,8 @@ class Level3:
                         
                         for space in self.letter_spaces:
                             if space.rect.collidepoint(event.pos) and not space.occupied:
-                                letter.rect.center = space.rect.center
-                                letter.placed = True
-                                space.occupied = True
-                                space.current_item = letter
+                                self.history.append(self.snapshot())
+                                place_item(self.board, space, letter)
                                 placed = True
                                 self.notifier.notify({"type": "speak", "text": letter.text})
                                 break
@@ -687,6 +699,8 @@ class ChiapasGame:
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     self.running = False
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_BACKSPACE:
+                    self.level_instance.undo()
                 
                 level_completed = self.level_instance.handle_event(event)
                 if level_completed:
@@ -753,6 +767,9 @@ class ChiapasGame:
         screen.blit(time_text, (20, 20))
         screen.blit(level_text, (20, 50))
         screen.blit(score_text, (20, 80))
+
+        undo_text = font_small.render("Retroceso: deshacer", True, BLACK)
+        screen.blit(undo_text, (20, HEIGHT - 40))
         
 
 
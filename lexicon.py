@@ -0,0 +1,225 @@
+"""Léxico del juego e índice de sílabas para generar distractores.
+
+Este módulo no depende de pygame para que las herramientas de construcción
+y las simulaciones puedan usarlo sin abrir una ventana.
+"""
+import random
+from collections import Counter, defaultdict
+
+VOWELS = "aeiouáéíóú"
+_PLAIN_VOWELS = str.maketrans("áéíóú", "aeiou")
+
+LEVEL1_WORDS = ["computadora", "telefono", "elefante", "mariposa", "biblioteca", "universidad"]
+LEVEL2_WORDS = ["caminar", "pelota", "ventana", "caballo", "escuela", "jardín", "montaña", "libro"]
+LEVEL3_WORD_GROUPS = {
+    "mariposa": ["mar", "piso", "rosa", "sopa", "ramo", "pasa"],
+    "elefante": ["ele", "fante", "tela", "lefa", "flan", "ante"],
+    "biblioteca": ["libro", "teca", "bota", "beca", "lote", "biblia"]
+}
+
+# Sílabas de relleno que no salen del léxico: las que el juego usaba antes
+# como distractores fijos más las combinaciones consonante-vocal comunes.
+EXTRA_SYLLABLES = (
+    ["la", "lo", "pa", "sa", "ti", "ma", "no", "que", "de", "en", "ción", "mente", "ando", "iendo"]
+    + [c + v for c in "bcdfglmnprstv" for v in "aeiou"]
+)
+
+EASY, MEDIUM, HARD = 0, 1, 2
+
+# Inicios de sílaba que un estudiante confunde con facilidad al oído.
+_ONSET_GROUPS = [
+    ("b", "v", "p"),
+    ("d", "t"),
+    ("c", "qu", "k", "g"),
+    ("m", "n", "ñ"),
+    ("l", "r", "rr"),
+    ("ll", "y", "l"),
+    ("s", "z", "c"),
+]
+_VOWEL_NEIGHBOURS = {"a": "", "e": "i", "i": "e", "o": "u", "u": "o"}
+
+
+def split_syllables(word):
+    """Divide una palabra en sílabas cortando después de cada vocal"""
+    syllables = []
+    current_syllable = ""
+
+    for char in word:
+        current_syllable += char
+        if char in VOWELS:
+            syllables.append(current_syllable)
+            current_syllable = ""
+
+    if current_syllable:
+        if syllables:
+            syllables[-1] += current_syllable
+        else:
+            syllables.append(current_syllable)
+
+    if len(syllables) < 2:
+        mid = len(word) // 2
+        return [word[:mid], word[mid:]]
+
+    return syllables
+
+
+def split_onset(syllable):
+    """Separa una sílaba en inicio consonántico y rima"""
+    i = 0
+    while i < len(syllable) and syllable[i] not in VOWELS:
+        i += 1
+    return syllable[:i], syllable[i:].translate(_PLAIN_VOWELS)
+
+
+class SyllableIndex:
+    """Índice precalculado de sílabas sobre un léxico.
+
+    Guarda la frecuencia de cada sílaba, sus vecinas fonéticas y las que
+    comparten inicio o rima, de modo que elegir los distractores de un
+    tablero solo cuesta unos pocos sorteos sobre listas ya construidas.
+    """
+
+    def __init__(self, words, extra_syllables=()):
+        self.words = list(words)
+        self.syllables_of = {word: split_syllables(word) for word in self.words}
+        self.frequency = Counter(s for syllables in self.syllables_of.values() for s in syllables)
+
+        self.pool = list(self.frequency)
+        seen = set(self.pool)
+        for syllable in extra_syllables:
+            if syllable not in seen:
+                seen.add(syllable)
+                self.pool.append(syllable)
+
+        self._parts = {s: split_onset(s) for s in self.pool}
+        self._by_onset = defaultdict(list)
+        self._by_rhyme = defaultdict(list)
+        for syllable, (onset, rhyme) in self._parts.items():
+            if onset:
+                self._by_onset[onset].append(syllable)
+            self._by_rhyme[rhyme].append(syllable)
+
+        self._onset_neighbours = defaultdict(set)
+        for group in _ONSET_GROUPS:
+            for onset in group:
+                self._onset_neighbours[onset].update(o for o in group if o != onset)
+
+        self._weighted_pool = self._weighted(self.pool)
+        self._tiers = {}
+        self._constraints = {}
+        for word, syllables in self.syllables_of.items():
+            for syllable in syllables:
+                self._tiers_for(syllable)
+            self._constraints_for(word, syllables)
+
+    def _weighted(self, syllables):
+        # Repetir cada sílaba según su frecuencia permite sortear en O(1).
+        return [s for s in syllables for _ in range(1 + self.frequency[s])]
+
+    def _tiers_for(self, syllable):
+        tiers = self._tiers.get(syllable)
+        if tiers is not None:
+            return tiers
+
+        onset, rhyme = self._parts.get(syllable) or split_onset(syllable)
+        shared = set(self._by_rhyme.get(rhyme, ()))
+        if onset:
+            shared.update(self._by_onset.get(onset, ()))
+        shared.discard(syllable)
+
+        neighbours = set()
+        for other in self._onset_neighbours.get(onset, ()):
+            neighbours.update(s for s in self._by_onset.get(other, ()) if self._parts[s][1] == rhyme)
+        if rhyme and _VOWEL_NEIGHBOURS.get(rhyme[0]):
+            swapped = _VOWEL_NEIGHBOURS[rhyme[0]] + rhyme[1:]
+            neighbours.update(s for s in self._by_rhyme.get(swapped, ()) if self._parts[s][0] == onset)
+        neighbours.discard(syllable)
+
+        related = shared | neighbours | {syllable}
+        tiers = (related, self._weighted(sorted(shared)), self._weighted(sorted(neighbours)))
+        self._tiers[syllable] = tiers
+        return tiers
+
+    def _constraints_for(self, word, syllables):
+        """Sílabas prohibidas y grupos que juntos formarían otra palabra válida"""
+        constraints = self._constraints.get(word)
+        if constraints is not None:
+            return constraints
+
+        needed = Counter(syllables)
+        # Trozos de la propia palabra permitirían otra forma de partirla.
+        banned = {s for s in self.pool if s in word}
+        groups = []
+        for other, other_syllables in self.syllables_of.items():
+            if other == word or len(other_syllables) != len(syllables):
+                continue
+            missing = Counter(other_syllables) - needed
+            total = sum(missing.values())
+            if total == 1:
+                banned.update(missing)
+            elif total > 1:
+                groups.append(missing)
+
+        constraints = (banned, groups)
+        self._constraints[word] = constraints
+        return constraints
+
+    def _draw(self, targets, tier, rng):
+        if tier == EASY:
+            candidate = rng.choice(self._weighted_pool)
+            for target in targets:
+                if candidate in self._tiers_for(target)[0]:
+                    return None
+            return candidate
+        candidates = self._tiers_for(rng.choice(targets))[tier]
+        return rng.choice(candidates) if candidates else None
+
+    def _completes_word(self, candidate, chosen, groups):
+        for group in groups:
+            if candidate not in group:
+                continue
+            available = Counter(chosen)
+            available[candidate] += 1
+            if all(available[s] >= n for s, n in group.items()):
+                return True
+        return False
+
+    def distractors(self, word, count, difficulty=MEDIUM, rng=random):
+        """Devuelve `count` sílabas distractoras distintas para `word`.
+
+        Con dificultad HARD se prefieren vecinas fonéticas, con MEDIUM las que
+        comparten inicio o rima y con EASY sílabas sin parecido; si un nivel
+        no alcanza se completa con el siguiente más fácil. Nunca se elige una
+        sílaba que permita formar otra palabra válida del léxico.
+        """
+        targets = self.syllables_of.get(word) or split_syllables(word)
+        banned, groups = self._constraints_for(word, targets)
+        taken = set(targets) | banned
+        chosen = []
+
+        for tier in range(difficulty, EASY - 1, -1):
+            attempts = 0
+            while len(chosen) < count and attempts < count * 8:
+                attempts += 1
+                candidate = self._draw(targets, tier, rng)
+                if candidate is None or candidate in taken:
+                    continue
+                if self._completes_word(candidate, chosen, groups):
+                    continue
+                chosen.append(candidate)
+                taken.add(candidate)
+
+        if len(chosen) < count:
+            # Último recurso si los sorteos fallan: recorrer el resto del índice.
+            for candidate in rng.sample(self.pool, len(self.pool)):
+                if len(chosen) >= count:
+                    break
+                if candidate in taken or self._completes_word(candidate, chosen, groups):
+                    continue
+                chosen.append(candidate)
+                taken.add(candidate)
+
+        return chosen
+
+
+SYLLABLE_INDEX = SyllableIndex(LEVEL1_WORDS + LEVEL2_WORDS, EXTRA_SYLLABLES)
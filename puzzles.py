@@ -0,0 +1,328 @@
+"""Generación de tableros y paquetes de niveles precalculados.
+
+Cada nivel se describe como un diccionario con la palabra, los espacios
+(texto correcto y posición) y las fichas (texto y posición). El juego puede
+generarlos al vuelo o tomarlos de un paquete construido de antemano con:
+
+    python puzzles.py --count 5000
+
+que genera los tableros en varios procesos, descarta los que no tienen
+solución única o no caben en pantalla, y los guarda en PACK_PATH.
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import random
+import tempfile
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from lexicon import (
+    EXTRA_SYLLABLES, HARD, LEVEL1_WORDS, LEVEL2_WORDS, LEVEL3_WORD_GROUPS, MEDIUM, SYLLABLE_INDEX, split_syllables,
+)
+
+PACK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "puzzles.pack.gz")
+PACK_VERSION = 2
+
+# "hud" son rectángulos fijos con textos o botones de cada nivel y
+# "hud_bands" franjas (y, alto) de textos centrados que pueden ocupar todo el
+# ancho; las fichas y los espacios no pueden taparlos. "tile_bottom" es la
+# altura máxima que pueden alcanzar las fichas antes de añadir columnas.
+LAYOUTS = {
+    1: {"space_y": 200, "space_size": (100, 50), "space_step": 110,
+        "tile_origin": (150, 350), "tile_size": (100, 50), "tile_step": (180, 80), "columns": 4,
+        "tile_bottom": 490,
+        "hud": [(-150, 20, 150, 30)],
+        "hud_bands": [(120, 40), (160, 30), (490, 70)]},
+    2: {"space_y": 200, "space_size": (100, 50), "space_step": 110,
+        "tile_origin": (100, 330), "tile_size": (100, 50), "tile_step": (120, 70), "columns": 7,
+        "tile_bottom": 500,
+        "hud": [(-150, 20, 150, 60)],
+        "hud_bands": [(100, 30), (150, 50), (500, 40)]},
+    3: {"space_y": 250, "space_size": (40, 40), "space_step": 50,
+        "tile_origin": (150, 355), "tile_size": (40, 40), "tile_step": (70, 60), "columns": 12,
+        "tile_bottom": 400,
+        "hud": [(-150, 20, 150, 30), (300, 300, 270, 50), (50, 400, 420, 160)],
+        "hud_bands": [(20, 50), (80, 50), (130, 30), (170, 40), (490, 70)]},
+}
+# Tiempo, nivel y puntos arriba a la izquierda y la ayuda de deshacer abajo.
+GAME_HUD = [(20, 20, 200, 90), (20, -40, 250, 30)]
+DISTRACTORS = {1: (3, MEDIUM), 2: (10, HARD)}
+LEVEL3_REQUIRED_WORDS = 3
+
+
+def row_layout(count, layout, width):
+    """Posiciones de una fila de espacios centrada en pantalla"""
+    step = layout["space_step"]
+    start_x = width // 2 - (count * step) // 2
+    return [(start_x + i * step, layout["space_y"]) for i in range(count)]
+
+
+def grid_layout(count, layout, width, height):
+    """Posiciones de las fichas en rejilla; añade columnas si las filas no caben"""
+    x0, y0 = layout["tile_origin"]
+    step_x, step_y = layout["tile_step"]
+    tile_w, tile_h = layout["tile_size"]
+    max_columns = max(1, (width - x0 - tile_w) // step_x + 1)
+    columns = min(layout["columns"], max_columns)
+    rows = -(-count // columns)
+    if y0 + (rows - 1) * step_y + tile_h > min(height, layout["tile_bottom"]):
+        columns = max_columns
+    return [(x0 + (i % columns) * step_x, y0 + (i // columns) * step_y) for i in range(count)]
+
+
+def _syllable_board(level, words, rng, width, height):
+    layout = LAYOUTS[level]
+    count, difficulty = DISTRACTORS[level]
+    word = rng.choice(words)
+    syllables = split_syllables(word)
+    tiles = syllables + SYLLABLE_INDEX.distractors(word, count, difficulty, rng)
+    rng.shuffle(tiles)
+    return {
+        "level": level,
+        "word": word,
+        "spaces": [(s, x, y) for s, (x, y) in zip(syllables, row_layout(len(syllables), layout, width))],
+        "tiles": [(t, x, y) for t, (x, y) in zip(tiles, grid_layout(len(tiles), layout, width, height))],
+        "words": [],
+    }
+
+
+def generate_level1(rng, width, height):
+    return _syllable_board(1, LEVEL1_WORDS, rng, width, height)
+
+
+def generate_level2(rng, width, height):
+    return _syllable_board(2, LEVEL2_WORDS, rng, width, height)
+
+
+def generate_level3(rng, width, height):
+    layout = LAYOUTS[3]
+    word = rng.choice(list(LEVEL3_WORD_GROUPS))
+    letters = list(word)
+    rng.shuffle(letters)
+    available = Counter(word)
+    # Solo se ofrecen las palabras que de verdad se pueden formar con las letras.
+    words = [w for w in LEVEL3_WORD_GROUPS[word] if not Counter(w) - available]
+    return {
+        "level": 3,
+        "word": word,
+        "spaces": [("", x, y) for x, y in row_layout(len(word), layout, width)],
+        "tiles": [(t, x, y) for t, (x, y) in zip(letters, grid_layout(len(letters), layout, width, height))],
+        "words": words,
+    }
+
+
+GENERATORS = {1: generate_level1, 2: generate_level2, 3: generate_level3}
+
+
+def _segmentations(word, tiles, slots):
+    """Cuenta las formas de escribir `word` con exactamente `slots` fichas distintas"""
+    def count(rest, remaining, left):
+        if not rest:
+            return 1 if left == 0 else 0
+        if left == 0:
+            return 0
+        total = 0
+        for tile in list(remaining):
+            if remaining[tile] and rest.startswith(tile):
+                remaining[tile] -= 1
+                total += count(rest[len(tile):], remaining, left - 1)
+                remaining[tile] += 1
+        return total
+    return count(word, Counter(t for t in tiles if t), slots)
+
+
+def hud_rects(level, width, height):
+    """Rectángulos reservados para los textos y botones del nivel en pantalla"""
+    layout = LAYOUTS[level]
+    rects = [(x + width if x < 0 else x, y + height if y < 0 else y, w, h)
+             for x, y, w, h in GAME_HUD + layout["hud"]]
+    rects += [(0, y, width, h) for y, h in layout["hud_bands"]]
+    return rects
+
+
+def _overlaps(a, b):
+    x, y, w, h = a
+    ox, oy, ow, oh = b
+    return x < ox + ow and ox < x + w and y < oy + oh and oy < y + h
+
+
+def _fits(instance, width, height):
+    layout = LAYOUTS[instance["level"]]
+    rects = [(x, y) + layout["space_size"] for _, x, y in instance["spaces"]]
+    rects += [(x, y) + layout["tile_size"] for _, x, y in instance["tiles"]]
+    hud = hud_rects(instance["level"], width, height)
+    for i, rect in enumerate(rects):
+        x, y, w, h = rect
+        if x < 0 or y < 0 or x + w > width or y + h > height:
+            return False
+        if any(_overlaps(rect, other) for other in rects[i + 1:]):
+            return False
+        if any(_overlaps(rect, reserved) for reserved in hud):
+            return False
+    return True
+
+
+def verify(instance, width, height):
+    """Comprueba que el tablero tiene solución, es única y cabe en pantalla"""
+    if not _fits(instance, width, height):
+        return False
+
+    tiles = [t for t, _, _ in instance["tiles"]]
+    word = instance["word"]
+    if instance["level"] == 3:
+        words = instance["words"]
+        if len(words) < LEVEL3_REQUIRED_WORDS or len(set(words)) != len(words):
+            return False
+        available = Counter(tiles)
+        return all(not Counter(w) - available for w in words)
+
+    slots = len(instance["spaces"])
+    if "".join(t for t, _, _ in instance["spaces"]) != word:
+        return False
+    if Counter(t for t, _, _ in instance["spaces"]) - Counter(tiles):
+        return False
+    if _segmentations(word, tiles, slots) != 1:
+        return False
+    return not any(
+        _segmentations(other, tiles, slots)
+        for other in SYLLABLE_INDEX.words if other != word
+    )
+
+
+def content_hash():
+    """Huella del léxico y la disposición con los que se verificaron los tableros"""
+    content = {
+        "words": [LEVEL1_WORDS, LEVEL2_WORDS, LEVEL3_WORD_GROUPS, EXTRA_SYLLABLES],
+        "layouts": LAYOUTS,
+        "hud": GAME_HUD,
+        "distractors": DISTRACTORS,
+        "required": LEVEL3_REQUIRED_WORDS,
+    }
+    text = json.dumps(content, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def _encode(instance, strings):
+    def sid(text):
+        if text not in strings:
+            strings[text] = len(strings)
+        return strings[text]
+    return [
+        sid(instance["word"]),
+        [v for t, x, y in instance["spaces"] for v in (sid(t), x, y)],
+        [v for t, x, y in instance["tiles"] for v in (sid(t), x, y)],
+        [sid(w) for w in instance["words"]],
+    ]
+
+
+def _build_chunk(level, seed, count, width, height):
+    rng = random.Random(seed)
+    generate = GENERATORS[level]
+    instances = []
+    for _ in range(count):
+        instance = generate(rng, width, height)
+        if verify(instance, width, height):
+            instances.append(instance)
+    return instances
+
+
+def build_pack(count, width, height, seed=0, workers=None, chunk=250):
+    """Genera y verifica en paralelo hasta `count` tableros distintos por nivel"""
+    levels = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Se envían todos los trozos de todos los niveles antes de esperar resultados.
+        jobs = {
+            level: [pool.submit(_build_chunk, level, seed * 1000003 + level * 7919 + i, chunk, width, height)
+                    for i in range(-(-count // chunk))]
+            for level in GENERATORS
+        }
+        for level, level_jobs in jobs.items():
+            unique = {}
+            for job in level_jobs:
+                for instance in job.result():
+                    key = json.dumps(instance, sort_keys=True, ensure_ascii=False)
+                    unique.setdefault(key, instance)
+            levels[level] = list(unique.values())[:count]
+    return levels
+
+
+def write_pack(path, levels, width, height):
+    """Guarda el paquete; se escribe aparte y se renombra para no dejarlo a medias"""
+    strings = {}
+    encoded = {str(level): [_encode(i, strings) for i in instances] for level, instances in levels.items()}
+    data = {"version": PACK_VERSION, "size": [width, height], "content": content_hash(),
+            "strings": list(strings), "levels": encoded}
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".puzzles-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as raw, gzip.open(raw, "wt", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class PuzzlePack:
+    """Paquete de tableros cargado en memoria; sortear uno cuesta O(1)"""
+
+    def __init__(self, strings, levels):
+        self.strings = strings
+        self.levels = levels
+
+    def __len__(self):
+        return sum(len(records) for records in self.levels.values())
+
+    def sample(self, level, rng=random):
+        records = self.levels.get(level)
+        if not records:
+            return None
+        word, spaces, tiles, words = rng.choice(records)
+        s = self.strings
+        return {
+            "level": level,
+            "word": s[word],
+            "spaces": [(s[spaces[i]], spaces[i + 1], spaces[i + 2]) for i in range(0, len(spaces), 3)],
+            "tiles": [(s[tiles[i]], tiles[i + 1], tiles[i + 2]) for i in range(0, len(tiles), 3)],
+            "words": [s[w] for w in words],
+        }
+
+
+def load_pack(path, width, height):
+    """Carga un paquete; devuelve None si falta, está dañado o no corresponde
+    a esta pantalla o al léxico y la disposición actuales"""
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != PACK_VERSION or data.get("size") != [width, height]:
+            return None
+        if data.get("content") != content_hash():
+            return None
+        return PuzzlePack(data["strings"], {int(level): records for level, records in data["levels"].items()})
+    except (OSError, EOFError, ValueError, KeyError, TypeError, AttributeError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera el paquete de niveles de Chiapas Puede")
+    parser.add_argument("--count", type=int, default=2000, help="tableros por nivel")
+    parser.add_argument("--width", type=int, default=1024)
+    parser.add_argument("--height", type=int, default=768)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--output", default=PACK_PATH)
+    args = parser.parse_args()
+
+    levels = build_pack(args.count, args.width, args.height, args.seed, args.workers)
+    write_pack(args.output, levels, args.width, args.height)
+    for level, instances in sorted(levels.items()):
+        print(f"Nivel {level}: {len(instances)} tableros")
+    print(f"Paquete guardado en {args.output}")
+
+
+if __name__ == "__main__":
+    main()
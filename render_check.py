@@ -0,0 +1,270 @@
+"""Comparación de cuadros renderizados contra cuadros de referencia.
+
+Dibuja estados preparados de cada nivel y de ChiapasGame sin abrir ventana,
+los compara píxel a píxel con las imágenes guardadas en GOLDEN_DIR y mide
+cuánto tarda cada draw(). Uso:
+
+    python render_check.py --update      # graba los cuadros de referencia
+    python render_check.py               # compara y guarda mapas de diferencias
+
+Junto a los PNG se guarda la suma CRC32 de cada cuadro: si coincide, el
+cuadro se da por bueno sin decodificar la imagen; si no, se compara con
+NumPy y se guardan el cuadro y su mapa de diferencias.
+
+Las fuentes del sistema cambian el resultado, así que los cuadros de
+referencia solo valen para la máquina (o imagen de CI) que los grabó.
+"""
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import json
+import random
+import sys
+import time
+import zlib
+from operator import attrgetter
+
+import numpy as np
+import pygame
+
+import game
+from game import ChiapasGame, GameNotifier, Level1, Level2, Level3, place_item
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+GOLDEN_DIR = os.path.join(HERE, "golden")
+DIFF_DIR = os.path.join(HERE, "render_diffs")
+DIGESTS_FILE = "digests.json"
+
+
+class FrozenTimer:
+    def get_time(self):
+        return "00:00"
+
+
+def _new_level(cls, seed):
+    # Los tableros se generan con la semilla para que no dependan del paquete instalado.
+    game.puzzle_pack = None
+    random.seed(seed)
+    return cls(GameNotifier())
+
+
+def _fill(level, spaces, items, texts):
+    """Coloca en orden, en los primeros espacios, fichas libres con esos textos"""
+    for space, text in zip(spaces, texts):
+        item = next(i for i in items if i.text == text and not i.placed)
+        place_item(level.board, space, item)
+    level.update()
+
+
+def _wrong_texts(level):
+    distractor = next(i.text for i in level.draggables if i.text not in level.board.correct_texts)
+    return [distractor] + list(level.board.correct_texts[1:])
+
+
+def _syllable_states(cls, seed, answer):
+    """Estados de un nivel de sílabas; `answer` obtiene las sílabas correctas"""
+    def start():
+        return _new_level(cls, seed)
+
+    def partial():
+        level = start()
+        _fill(level, level.spaces, level.draggables, answer(level)[:1])
+        return level
+
+    def wrong():
+        level = start()
+        _fill(level, level.spaces, level.draggables, _wrong_texts(level))
+        return level
+
+    def solved():
+        level = start()
+        _fill(level, level.spaces, level.draggables, answer(level))
+        return level
+
+    return {"start": start, "partial": partial, "wrong": wrong, "solved": solved}
+
+
+def _level3_states(seed):
+    def start():
+        return _new_level(Level3, seed)
+
+    def partial():
+        level = start()
+        _fill(level, level.letter_spaces, level.draggable_letters, level.possible_words[0])
+        return level
+
+    def found():
+        level = start()
+        level.found_words.extend(level.possible_words[:2])
+        return level
+
+    def error():
+        level = start()
+        level.incorrect_attempts = 1
+        level.error_message = "Palabra no válida o ya encontrada"
+        level.error_timer = 180
+        return level
+
+    return {"start": start, "partial": partial, "found": found, "error": error}
+
+
+def _game_frame(level_factory, index):
+    def build():
+        chiapas = ChiapasGame.__new__(ChiapasGame)
+        chiapas.notifier = GameNotifier()
+        chiapas.timer = FrozenTimer()
+        chiapas.levels = [Level1, Level2, Level3]
+        chiapas.current_level_index = index
+        chiapas.level_instance = level_factory()
+        chiapas.score = index * 100
+        return chiapas
+    return build
+
+
+def scripted_frames(seeds):
+    """Devuelve (nombre, constructor, función de dibujo) para cada cuadro"""
+    frames = []
+    for seed in range(seeds):
+        for prefix, index, states in (
+                ("level1", 0, _syllable_states(Level1, seed, attrgetter("correct_syllables"))),
+                ("level2", 1, _syllable_states(Level2, seed, attrgetter("syllables"))),
+                ("level3", 2, _level3_states(seed))):
+            for state, factory in states.items():
+                frames.append((f"{prefix}_{state}_{seed:03d}", factory, _draw_level))
+            frames.append((f"game_{prefix}_{seed:03d}", _game_frame(states["start"], index), _draw_game))
+    return frames
+
+
+def _draw_level(level, surface):
+    if isinstance(level, Level2):
+        level.start_time = time.time()
+    surface.fill(game.WHITE)
+    level.draw(surface)
+
+
+def _draw_game(chiapas, surface):
+    if isinstance(chiapas.level_instance, Level2):
+        chiapas.level_instance.start_time = time.time()
+    chiapas.draw()
+    surface.blit(game.screen, (0, 0))
+
+
+def render(factory, draw, repeat):
+    """Dibuja un estado `repeat` veces y devuelve el cuadro y el mejor tiempo"""
+    target = factory()
+    surface = pygame.Surface((game.WIDTH, game.HEIGHT))
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        draw(target, surface)
+        best = min(best, time.perf_counter() - start)
+    return surface, best
+
+
+def compare(frame, golden, tolerance):
+    """Compara dos cuadros; devuelve None si coinciden o (píxeles, caja, mapa)"""
+    if frame.get_size() != golden.get_size():
+        width, height = frame.get_size()
+        return width * height, (0, 0, width, height), None
+    if golden.get_bitsize() != frame.get_bitsize() or golden.get_masks() != frame.get_masks():
+        golden = golden.convert(frame)
+    # Comparar los píxeles en bruto, sin copias, evita el cálculo de diferencias.
+    if np.array_equal(pygame.surfarray.pixels2d(frame), pygame.surfarray.pixels2d(golden)):
+        return None
+
+    a = pygame.surfarray.pixels3d(frame)
+    b = pygame.surfarray.pixels3d(golden)
+    diff = (np.maximum(a, b) - np.minimum(a, b)).max(axis=2)
+    base = b.mean(axis=2) * 0.3
+    del a, b
+
+    changed = diff > tolerance
+    if not changed.any():
+        return None
+
+    xs = np.flatnonzero(changed.any(axis=1))
+    ys = np.flatnonzero(changed.any(axis=0))
+    box = (int(xs[0]), int(ys[0]), int(xs[-1] - xs[0] + 1), int(ys[-1] - ys[0] + 1))
+
+    heatmap = np.repeat(base[..., None], 3, axis=2).astype(np.uint8)
+    heatmap[changed] = 0
+    heatmap[..., 0][changed] = 128 + diff[changed] // 2
+    return int(changed.sum()), box, heatmap
+
+
+def frame_digest(frame):
+    """Suma CRC32 de los bytes del cuadro, para no decodificar PNG si coincide"""
+    return f"{zlib.crc32(frame.get_view('1')):08x}"
+
+
+def _load_digests(golden_dir):
+    try:
+        with open(os.path.join(golden_dir, DIGESTS_FILE), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Comprueba los cuadros renderizados contra los de referencia")
+    parser.add_argument("--update", action="store_true", help="graba los cuadros de referencia")
+    parser.add_argument("--seeds", type=int, default=40, help="tableros distintos por nivel")
+    parser.add_argument("--tolerance", type=int, default=0, help="diferencia máxima por canal")
+    parser.add_argument("--repeat", type=int, default=3, help="veces que se mide cada draw()")
+    parser.add_argument("--golden-dir", default=GOLDEN_DIR)
+    parser.add_argument("--diff-dir", default=DIFF_DIR)
+    args = parser.parse_args()
+
+    os.makedirs(args.golden_dir, exist_ok=True)
+    started = time.perf_counter()
+    failures = 0
+    timings = []
+
+    digests = {} if args.update else _load_digests(args.golden_dir)
+
+    for name, factory, draw in scripted_frames(args.seeds):
+        frame, elapsed = render(factory, draw, args.repeat)
+        timings.append(elapsed)
+        path = os.path.join(args.golden_dir, name + ".png")
+
+        if args.update:
+            pygame.image.save(frame, path)
+            digests[name] = frame_digest(frame)
+            continue
+        if digests.get(name) == frame_digest(frame):
+            continue
+        if not os.path.exists(path):
+            failures += 1
+            print(f"FALTA  {name}: no hay cuadro de referencia")
+            continue
+
+        result = compare(frame, pygame.image.load(path), args.tolerance)
+        if result is None:
+            continue
+        failures += 1
+        pixels, (x, y, w, h), heatmap = result
+        print(f"DIFIERE {name}: {pixels} píxeles en x={x} y={y} {w}x{h}  draw {elapsed * 1000:.2f} ms")
+        if heatmap is not None:
+            os.makedirs(args.diff_dir, exist_ok=True)
+            pygame.image.save(frame, os.path.join(args.diff_dir, name + ".png"))
+            pygame.image.save(pygame.surfarray.make_surface(heatmap),
+                              os.path.join(args.diff_dir, name + "_diff.png"))
+
+    timings.sort()
+    total = time.perf_counter() - started
+    print(f"{len(timings)} cuadros en {total:.2f} s; draw mediana {timings[len(timings) // 2] * 1000:.2f} ms, "
+          f"máxima {timings[-1] * 1000:.2f} ms")
+    if args.update:
+        with open(os.path.join(args.golden_dir, DIGESTS_FILE), "w", encoding="utf-8") as f:
+            json.dump(digests, f, indent=0, sort_keys=True)
+        print(f"Cuadros de referencia guardados en {args.golden_dir}")
+    elif failures:
+        print(f"{failures} cuadros no coinciden")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+from board import EMPTY, Board
+
+
+def make_board():
+    return Board(["pe", "lo", "ta"], ["ta", "ma", "pe", "lo"])
+
+
+def test_place_tracks_count_mask_and_word():
+    board = make_board()
+    board.place(1, 3)
+    assert board.occupied_count == 1
+    assert board.correct_mask == 0b010
+    assert board.word == "lo"
+    assert board.dirty
+    assert list(board.slot_items) == [EMPTY, 3, EMPTY]
+    assert list(board.item_slots) == [EMPTY, EMPTY, EMPTY, 1]
+
+    board.place(0, 2)
+    board.place(2, 1)
+    assert board.is_full()
+    assert not board.is_correct()
+    assert not board.is_slot_correct(2)
+    assert board.word == "peloma"
+
+
+def test_remove_frees_slot_and_tile():
+    board = make_board()
+    board.place(0, 2)
+    board.place(1, 3)
+    assert board.remove(0) == 2
+    assert board.occupied_count == 1
+    assert board.correct_mask == 0b010
+    assert board.word == "lo"
+    assert board.item_slots[2] == EMPTY
+    assert board.remove(0) == EMPTY
+    assert board.occupied_count == 1
+
+
+def test_placing_a_placed_tile_moves_it():
+    board = make_board()
+    board.place(0, 2)
+    board.place(1, 2)
+    assert list(board.slot_items) == [EMPTY, 2, EMPTY]
+    assert list(board.item_slots) == [EMPTY, EMPTY, 1, EMPTY]
+    assert board.occupied_count == 1
+    assert board.correct_mask == 0
+    assert board.word == "pe"
+
+
+def test_placing_over_a_tile_frees_it():
+    board = make_board()
+    board.place(2, 1)
+    board.place(2, 0)
+    assert board.item_slots[1] == EMPTY
+    assert board.item_slots[0] == 2
+    assert board.occupied_count == 1
+    assert board.is_slot_correct(2)
+    assert board.word == "ta"
+
+
+def test_snapshot_restore_round_trip():
+    board = make_board()
+    board.place(0, 2)
+    board.place(1, 1)
+    state = board.snapshot()
+    fields = (list(board.slot_items), list(board.item_slots),
+              board.occupied_count, board.correct_mask, board.word)
+
+    board.remove(0)
+    board.place(1, 3)
+    board.place(2, 0)
+    assert not board.is_correct()
+    assert board.word != fields[4]
+
+    board.restore(state)
+    assert (list(board.slot_items), list(board.item_slots),
+            board.occupied_count, board.correct_mask, board.word) == fields
+    assert not board.dirty
+
+    # Restaurar no comparte memoria con la copia guardada.
+    board.place(2, 0)
+    board.restore(state)
+    assert board.word == "pema"
+    assert board.occupied_count == 2
+    assert board.correct_mask == 0b001
+
+
+def test_restore_solved_state():
+    board = make_board()
+    empty = board.snapshot()
+    board.place(0, 2)
+    board.place(1, 3)
+    board.place(2, 0)
+    solved = board.snapshot()
+    board.restore(empty)
+    assert board.occupied_count == 0 and board.word == ""
+    board.restore(solved)
+    assert board.is_full() and board.is_correct()
+    assert board.word == "pelota"
@@ -0,0 +1,179 @@
+import os
+import random
+
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+pytest.importorskip("pygame")
+pytest.importorskip("pyttsx3")
+
+import game  # noqa: E402
+from game import GameNotifier, Level1, Level2, Level3, place_item  # noqa: E402
+
+
+def new_level(cls, seed=0):
+    game.puzzle_pack = None
+    random.seed(seed)
+    return cls(GameNotifier())
+
+
+def free_item(items, text):
+    return next(item for item in items if item.text == text and not item.placed)
+
+
+def fill(level, texts):
+    for space, text in zip(level.spaces, texts):
+        place_item(level.board, space, free_item(level.draggables, text))
+
+
+def wrong_answer(level):
+    answer = level.board.correct_texts
+    distractor = next(item.text for item in level.draggables if item.text not in answer)
+    return [distractor] + list(answer[1:])
+
+
+def test_update_validates_only_after_a_placement():
+    level = new_level(Level1)
+    answer = level.correct_syllables
+    fill(level, answer[:-1])
+    level.update()
+    assert not level.board.dirty
+    assert not level.completed
+
+    last_space = level.spaces[len(answer) - 1]
+    place_item(level.board, last_space, free_item(level.draggables, answer[-1]))
+    assert level.board.dirty and not level.completed
+    level.update()
+    assert level.completed
+    assert not level.board.dirty
+
+
+def test_update_ignores_a_full_board_without_a_placement_event():
+    level = new_level(Level1)
+    fill(level, wrong_answer(level))
+    level.board.dirty = False
+    for _ in range(5):
+        level.update()
+    assert level.current_attempt == 0
+    assert level.board.is_full()
+
+
+def test_level1_wrong_board_clears_every_tile_and_spends_an_attempt():
+    level = new_level(Level1)
+    fill(level, wrong_answer(level))
+    level.update()
+    level.update()
+
+    assert level.current_attempt == 1
+    assert level.error_timer > 0
+    assert level.board.occupied_count == 0
+    assert level.board.word == ""
+    assert not any(space.occupied or space.current_item for space in level.spaces)
+    for item in level.draggables:
+        assert not item.placed
+        assert item.rect.topleft == item.original_pos
+
+
+def test_level2_wrong_board_removes_only_the_wrong_tiles():
+    level = new_level(Level2)
+    wrong = wrong_answer(level)
+    fill(level, wrong)
+    level.update()
+
+    assert level.error_count == 1
+    assert not level.completed
+    first, *rest = level.spaces
+    assert not first.occupied and first.current_item is None
+    wrong_item = next(item for item in level.draggables if item.text == wrong[0])
+    assert not wrong_item.placed
+    assert wrong_item.rect.topleft == wrong_item.original_pos
+    for space in rest:
+        assert space.occupied
+        assert space.current_item.rect.center == space.rect.center
+    assert level.board.occupied_count == len(rest)
+    assert level.board.word == "".join(wrong[1:])
+
+
+def test_level3_consumes_the_dirty_flag():
+    level = new_level(Level3)
+    letter = level.draggable_letters[0]
+    place_item(level.board, level.letter_spaces[0], letter)
+    assert level.get_current_word() == letter.text
+    level.update()
+    assert not level.board.dirty
+
+
+def drag(level, item, space):
+    """Arrastra una ficha hasta un espacio con eventos de ratón"""
+    pygame = game.pygame
+    level.handle_event(pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=item.rect.center))
+    level.handle_event(pygame.event.Event(pygame.MOUSEMOTION, pos=space.rect.center, rel=(0, 0), buttons=(1, 0, 0)))
+    level.handle_event(pygame.event.Event(pygame.MOUSEBUTTONUP, button=1, pos=space.rect.center))
+
+
+def test_undo_puts_tile_and_space_back():
+    level = new_level(Level1)
+    first, second = level.spaces[:2]
+    item_a = free_item(level.draggables, level.correct_syllables[0])
+    drag(level, item_a, first)
+    item_b = free_item(level.draggables, level.correct_syllables[1])
+    drag(level, item_b, second)
+    assert second.current_item is item_b
+
+    level.undo()
+    assert not item_b.placed
+    assert item_b.rect.topleft == item_b.original_pos
+    assert not second.occupied and second.current_item is None
+    assert item_a.placed and item_a.rect.center == first.rect.center
+    assert first.occupied and first.current_item is item_a
+    assert level.board.word == item_a.text
+    assert level.board.occupied_count == 1
+
+    level.undo()
+    assert not item_a.placed and item_a.rect.topleft == item_a.original_pos
+    assert not any(space.occupied for space in level.spaces)
+    assert level.board.word == ""
+
+    level.undo()
+    assert level.board.occupied_count == 0
+
+
+def test_undo_does_nothing_after_a_validated_full_board():
+    level = new_level(Level1)
+    for space, text in zip(level.spaces, wrong_answer(level)):
+        drag(level, free_item(level.draggables, text), space)
+    level.update()
+    assert level.current_attempt == 1
+
+    level.undo()
+    assert level.current_attempt == 1
+    assert level.board.occupied_count == 0
+    assert not any(item.placed for item in level.draggables)
+
+
+def test_level3_undo_keeps_found_words():
+    level = new_level(Level3)
+    level.found_words.append(level.possible_words[0])
+    letter = level.draggable_letters[0]
+    drag(level, letter, level.letter_spaces[0])
+    assert level.get_current_word() == letter.text
+
+    level.undo()
+    assert level.get_current_word() == ""
+    assert letter.rect.topleft == letter.original_pos
+    assert level.found_words == [level.possible_words[0]]
+
+
+def test_snapshot_restore_branches_a_level():
+    level = new_level(Level2)
+    state = level.snapshot()
+    fill(level, level.syllables)
+    level.update()
+    assert level.completed
+
+    level.restore(state)
+    assert not level.completed
+    assert level.board.occupied_count == 0
+    assert not any(space.occupied for space in level.spaces)
+    assert all(item.rect.topleft == item.original_pos for item in level.draggables)
@@ -0,0 +1,46 @@
+import random
+from collections import Counter
+
+import pytest
+
+from lexicon import EASY, HARD, MEDIUM, SYLLABLE_INDEX, split_syllables
+
+
+def spellings(word, tiles, slots):
+    """Formas de escribir `word` con exactamente `slots` fichas del tablero"""
+    def count(rest, remaining, left):
+        if not rest:
+            return 1 if left == 0 else 0
+        total = 0
+        for tile in list(remaining):
+            if left and remaining[tile] and rest.startswith(tile):
+                remaining[tile] -= 1
+                total += count(rest[len(tile):], remaining, left - 1)
+                remaining[tile] += 1
+        return total
+    return count(word, Counter(tiles), slots)
+
+
+def test_split_syllables():
+    assert split_syllables("pelota") == ["pe", "lo", "ta"]
+    assert split_syllables("caminar") == ["ca", "mi", "nar"]
+    assert split_syllables("jardín") == ["ja", "rdín"]
+
+
+@pytest.mark.parametrize("difficulty", [EASY, MEDIUM, HARD])
+@pytest.mark.parametrize("word", SYLLABLE_INDEX.words)
+def test_distractors_keep_a_single_answer(word, difficulty):
+    syllables = split_syllables(word)
+    rng = random.Random(word)
+    for count in (3, 10):
+        for _ in range(50):
+            distractors = SYLLABLE_INDEX.distractors(word, count, difficulty, rng)
+            assert len(distractors) == count
+            assert len(set(distractors)) == count
+            assert not set(distractors) & set(syllables)
+
+            tiles = syllables + distractors
+            assert spellings(word, tiles, len(syllables)) == 1
+            for other in SYLLABLE_INDEX.words:
+                if other != word:
+                    assert spellings(other, tiles, len(syllables)) == 0
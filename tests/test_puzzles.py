@@ -0,0 +1,116 @@
+import random
+
+import pytest
+
+import puzzles
+from puzzles import (
+    GENERATORS, LAYOUTS, build_pack, grid_layout, hud_rects, load_pack, verify, write_pack,
+)
+
+WIDTH, HEIGHT = 1024, 768
+
+
+def board_for(level, word, seed=0):
+    rng = random.Random(seed)
+    while True:
+        instance = GENERATORS[level](rng, WIDTH, HEIGHT)
+        if instance["word"] == word:
+            return instance
+
+
+@pytest.mark.parametrize("level", sorted(GENERATORS))
+def test_generated_boards_verify(level):
+    rng = random.Random(level)
+    for _ in range(200):
+        assert verify(GENERATORS[level](rng, WIDTH, HEIGHT), WIDTH, HEIGHT)
+
+
+def test_grid_layout_adds_columns_when_rows_pass_tile_bottom():
+    layout = LAYOUTS[1]
+    # Con las 4 columnas de siempre, 10 fichas ocuparían tres filas.
+    positions = grid_layout(10, layout, WIDTH, HEIGHT)
+    assert len(positions) == 10
+    assert len({x for x, _ in positions}) > layout["columns"]
+    tile_w, tile_h = layout["tile_size"]
+    assert all(x + tile_w <= WIDTH for x, _ in positions)
+    assert max(y for _, y in positions) + tile_h <= layout["tile_bottom"]
+
+
+def test_hud_rects_resolve_offsets_from_the_right_and_bottom():
+    rects = hud_rects(1, WIDTH, HEIGHT)
+    assert (WIDTH - 150, 20, 150, 30) in rects
+    assert (20, HEIGHT - 40, 250, 30) in rects
+    assert (0, 490, WIDTH, 70) in rects
+
+
+def test_segmentations_counts_every_spelling():
+    assert puzzles._segmentations("caballo", ["ca", "ba", "llo", "pe"], 3) == 1
+    assert puzzles._segmentations("caballo", ["ca", "ba", "llo", "cab", "a"], 3) == 2
+    assert puzzles._segmentations("caballo", ["ca", "ba", "llo"], 2) == 0
+
+
+def test_verify_rejects_a_second_spelling():
+    instance = board_for(2, "caballo")
+    assert verify(instance, WIDTH, HEIGHT)
+    answer = {text for text, _, _ in instance["spaces"]}
+    distractors = [i for i, (text, _, _) in enumerate(instance["tiles"]) if text not in answer]
+    for i, text in zip(distractors, ["cab", "a"]):
+        _, x, y = instance["tiles"][i]
+        instance["tiles"][i] = (text, x, y)
+    assert not verify(instance, WIDTH, HEIGHT)
+
+
+def test_verify_rejects_a_tile_over_the_hud():
+    instance = board_for(2, "pelota")
+    text, _, _ = instance["tiles"][-1]
+    # Franja del mensaje "¡Palabra completada!", libre de otras fichas.
+    instance["tiles"][-1] = (text, WIDTH // 2 - 50, 505)
+    assert not puzzles._fits(instance, WIDTH, HEIGHT)
+    assert not verify(instance, WIDTH, HEIGHT)
+
+
+def test_verify_rejects_an_unspellable_level3_word():
+    instance = board_for(3, "biblioteca")
+    assert verify(instance, WIDTH, HEIGHT)
+    assert "libro" not in instance["words"]
+    instance["words"].append("libro")
+    assert not verify(instance, WIDTH, HEIGHT)
+
+
+@pytest.fixture(scope="module")
+def small_pack():
+    return build_pack(20, WIDTH, HEIGHT, workers=1, chunk=20)
+
+
+def test_pack_round_trip(tmp_path, small_pack):
+    path = tmp_path / "puzzles.pack.gz"
+    write_pack(str(path), small_pack, WIDTH, HEIGHT)
+    assert [p.name for p in tmp_path.iterdir()] == [path.name]
+
+    pack = load_pack(str(path), WIDTH, HEIGHT)
+    assert len(pack) == sum(len(instances) for instances in small_pack.values())
+    rng = random.Random(0)
+    for level, instances in small_pack.items():
+        for _ in range(10):
+            assert pack.sample(level, rng) in instances
+    assert pack.sample(4) is None
+
+
+def test_truncated_pack_loads_as_none(tmp_path, small_pack):
+    path = tmp_path / "puzzles.pack.gz"
+    write_pack(str(path), small_pack, WIDTH, HEIGHT)
+    data = path.read_bytes()
+    path.write_bytes(data[:len(data) // 2])
+    assert load_pack(str(path), WIDTH, HEIGHT) is None
+
+
+def test_pack_for_other_screen_or_lexicon_loads_as_none(tmp_path, small_pack, monkeypatch):
+    path = tmp_path / "puzzles.pack.gz"
+    write_pack(str(path), small_pack, WIDTH, HEIGHT)
+    assert load_pack(str(path), 800, 600) is None
+    monkeypatch.setattr(puzzles, "LEVEL2_WORDS", puzzles.LEVEL2_WORDS + ["zapato"])
+    assert load_pack(str(path), WIDTH, HEIGHT) is None
+
+
+def test_missing_pack_loads_as_none(tmp_path):
+    assert load_pack(str(tmp_path / "missing.gz"), WIDTH, HEIGHT) is None